@@ -1,14 +1,14 @@
 """
 @author: libor_komanek
 """
-import itertools
+import functools
+import re
 import sys
 from PyQt6 import uic
 from PyQt6.QtWidgets import QApplication, QMainWindow, QLabel, QMessageBox
 from unidecode import unidecode
 from string import ascii_uppercase, digits
 import random
-from bidict import bidict
 
 qtCreatorFile = "ADFGVXCipher.ui"
 Ui_MainWindow, QtBaseClass = uic.loadUiType(qtCreatorFile)
@@ -17,8 +17,15 @@ lang_replacements: dict[str, list[str]] = {  # "language": ["what is replaced",
     "en": ["J", "I"],
     "cs": ["Q", "KJU"]
 }
+# translation tables replacing or removing the language-specific characters
+lang_translations: dict[str, dict[int, str]] = {
+    lang: str.maketrans({replaced: replacement}) for lang, (replaced, replacement) in lang_replacements.items()
+}
+lang_removals: dict[str, dict[int, None]] = {
+    lang: str.maketrans("", "", replaced) for lang, (replaced, _) in lang_replacements.items()
+}
 space_representation: str = "XSPEACEX"
-digit_representations: bidict[str, str] = bidict({  # two-way dictionary for converting digits to words and vice versa
+digit_representations: dict[str, str] = {  # dictionary for converting digits to words
     "0": "XZEROX",
     "1": "XONEX",
     "2": "XTWOX",
@@ -29,9 +36,25 @@ digit_representations: bidict[str, str] = bidict({  # two-way dictionary for con
     "7": "XSEVENX",
     "8": "XEIGHTX",
     "9": "XNINEX"
-})
-adfgx_headers: bidict[int, str] = bidict({0: "A", 1: "D", 2: "F", 3: "G", 4: "X"})
-adfgvx_headers: bidict[int, str] = bidict({0: "A", 1: "D", 2: "F", 3: "G", 4: "V", 5: "X"})
+}
+digit_representations_inverse: dict[str, str] = {v: k for k, v in digit_representations.items()}  # words to digits
+representation_pattern: re.Pattern = re.compile("|".join(map(re.escape, digit_representations.values())))
+adfgx_headers: dict[int, str] = {0: "A", 1: "D", 2: "F", 3: "G", 4: "X"}
+adfgvx_headers: dict[int, str] = {0: "A", 1: "D", 2: "F", 3: "G", 4: "V", 5: "X"}
+# byte translation tables converting header letters to their indices
+adfgx_header_indices: bytes = bytes.maketrans("".join(adfgx_headers.values()).encode(), bytes(adfgx_headers))
+adfgvx_header_indices: bytes = bytes.maketrans("".join(adfgvx_headers.values()).encode(), bytes(adfgvx_headers))
+
+
+def toAscii(text: str) -> str:
+    """Transliterates the given text to ASCII. Text which is already ASCII is returned as is.
+
+    :param text: original text
+    :return: ASCII representation of the text
+    """
+    if text.isascii():  # skip the costly transliteration
+        return text
+    return unidecode(text)
 
 
 def replaceLanguageSpecificCharacters(text: str, lang: str, remove: bool = False) -> str:
@@ -47,9 +70,7 @@ def replaceLanguageSpecificCharacters(text: str, lang: str, remove: bool = False
         return text
     text = text.upper()
     if lang in lang_replacements:
-        return text.replace(
-            lang_replacements[lang][0],
-            lang_replacements[lang][1] if remove is False else "")
+        return text.translate(lang_translations[lang] if remove is False else lang_removals[lang])
     else:
         raise ValueError("Invalid language specified.")
 
@@ -62,8 +83,7 @@ def filterMatrixData(adfgx: bool, data: str, lang: str = None) -> str:
     :param lang: language used for adfgx matrix generation
     :return: filtered matrix data
     """
-    data = unidecode(data).upper()
-    data = "".join(dict.fromkeys(data))
+    data = toAscii(data).upper()
     if adfgx is True:
         if lang is not None:
             if lang not in lang_replacements:
@@ -73,17 +93,33 @@ def filterMatrixData(adfgx: bool, data: str, lang: str = None) -> str:
                 raise ValueError(f"The matrix data contains '{replaced_char}' which cannot be used with the "
                                  f"specified language.")
             data = replaceLanguageSpecificCharacters(data, lang, True)
-        data = "".join(char for char in data if char.isalpha())
+        data = "".join(dict.fromkeys(filter(str.isalpha, data)))  # keep unique letters only
         if len(data) != 25:
             raise ValueError("The matrix data needs to have exactly 25 unique characters and only contain letters!")
     else:
-        data = "".join(char for char in data if char.isalnum())
+        data = "".join(dict.fromkeys(filter(str.isalnum, data)))  # keep unique letters and digits only
         if len(data) != 36:
             raise ValueError(
                 "The matrix data needs to have exactly 36 unique characters and only contain letters and digits!")
     return data
 
 
+@functools.lru_cache(maxsize=32)
+def matrixFromData(adfgx: bool, data: str, lang: str = None) -> tuple[tuple[str, ...], ...]:
+    """Creates a matrix from the given data after making sure they are valid.
+
+    The results are cached since the same data tend to be used repeatedly, hence the immutable matrix.
+
+    :param adfgx: whether the basic version of the cipher is used
+    :param data: the matrix data in the form of a string
+    :param lang: language used for adfgx matrix generation
+    :return: matrix in the form of a 2D tuple
+    """
+    data = filterMatrixData(adfgx, data, lang)
+    size: int = (5 if adfgx is True else 6)  # 5x5 or 6x6 matrix
+    return tuple(tuple(data[i + size * j] for i in range(size)) for j in range(size))
+
+
 def generateMatrix(adfgx: bool, data: str = None, lang: str = None) -> list[list[str]]:
     """Generates either a random new matrix or uses the given data to generate one.
 
@@ -95,16 +131,17 @@ def generateMatrix(adfgx: bool, data: str = None, lang: str = None) -> list[list
     :param lang: language used for adfgx matrix generation
     :return:
     """
-    if data is None:  # generate random data
-        data = ascii_uppercase
-        if adfgx is True:
-            data = replaceLanguageSpecificCharacters(data, lang)
-            data = "".join(dict.fromkeys(data))
-        else:
-            data += digits
-        data = "".join(random.sample(data, len(data)))
-    else:  # validate the data is valid
-        data = filterMatrixData(adfgx, data, lang)
+    if data is not None:  # validate the data and create a matrix from them
+        return [list(row) for row in matrixFromData(adfgx, data, lang)]
+
+    # generate random data
+    data = ascii_uppercase
+    if adfgx is True:
+        data = replaceLanguageSpecificCharacters(data, lang)
+        data = "".join(dict.fromkeys(data))
+    else:
+        data += digits
+    data = "".join(random.sample(data, len(data)))
 
     # create a matrix from the data
     size: int = (5 if adfgx is True else 6)  # 5x5 or 6x6 matrix
@@ -112,74 +149,65 @@ def generateMatrix(adfgx: bool, data: str = None, lang: str = None) -> list[list
     return matrix
 
 
-def convertCharacterRepresentations(text: str, adfgx: bool = False, reverse: bool = False) -> str:
-    """Converts characters in the given text to their representations. Can also reverse the conversions back.
+def convertCharacterRepresentations(text: str, adfgx: bool = False) -> str:
+    """Converts representations of characters in the given text back to the original characters.
 
-    Converts digits and spaces if the basic ADFGX cipher is used, otherwise only spaces are converted.
+    Converts digits and spaces back if the basic ADFGX cipher is used, otherwise only spaces are converted.
+    The conversion to representations is done by the plaintext translation table during filtering.
 
     :param text: the text to be modified
     :param adfgx: whether the basic version of the cipher is used
-    :param reverse: whether the process of conversion should be reversed
-    :return: modified text with possible representations of certain characters
+    :return: modified text with representations converted back to the original characters
     """
-    text = (  # convert spaces
-        text.replace(" ", space_representation)
-        if reverse is False else
-        text.replace(space_representation, " ")
-    )
+    text = text.replace(space_representation, " ")  # convert spaces
     if adfgx is True:  # convert digits if the 5x5 matrix is used
-        if reverse is False:
-            text = "".join(digit_representations[char] if char.isdigit() else char for char in text)
-        else:
-            for representation in digit_representations.inverse:
-                text = text.replace(representation, digit_representations.inverse[representation])
+        text = representation_pattern.sub(lambda match: digit_representations_inverse[match.group()], text)
     return text
 
 
+@functools.lru_cache(maxsize=32)
 def filterKeyword(keyword: str, input_len: int) -> str:
-    """Returns filtered keyword after making sure it's valid.
+    """Returns filtered keyword after making sure it's valid. The results are cached.
 
     :param keyword: the raw keyword
     :param input_len: the lenght of the input text this key will be used with
     :return: filtered keyword
     """
-    keyword = unidecode(keyword).upper().strip()
-    keyword = "".join(char for char in keyword if char.isalpha())
-    keyword = "".join(dict.fromkeys(keyword))  # remove duplicate characters
+    keyword = toAscii(keyword).upper().strip()
+    keyword = "".join(dict.fromkeys(filter(str.isalpha, keyword)))  # keep letters and remove duplicate characters
+    if len(keyword) < 1:
+        raise ValueError("The keyword must contain at least one letter!")
     if len(keyword) > input_len:  # the keyword cannot be longer than the text it's supposed to work with
         raise ValueError(f"The keyword is too long! "
                          f"Considering your input, it cannot be longer than {input_len} characters!")
     return keyword
 
 
-def encodeCharacter(char: str, matrix: list[list[str]]) -> str:
-    """Finds the two letters describing the position of the given character in the given matrix and returns them
-    in the form of a string.
-
-    :param char: character to be encoded
-    :param matrix: matrix to be searched
-    :return: string made up of two characters
-    """
-    for row in range(len(matrix)):
-        if char in matrix[row]:
-            col = matrix[row].index(char)
-            # decide if afgx or afgvx headers should be used
-            descriptors = (adfgvx_headers if len(matrix) == 6 else adfgx_headers)
-            return f"{descriptors[row]}{descriptors[col]}"
-    raise Exception("The character couldn't be found in the matrix during encoding.")
-
+@functools.lru_cache(maxsize=None)
+def plainTextTranslationTable(lang: str = None, adfgx: bool = False) -> dict[int, str or None]:
+    """Returns a translation table which filters an ASCII plaintext in a single pass.
 
-def decodeCharacter(pair: str, matrix: list[list[str]]) -> str:
-    """Uses the two letters describing a character's position in the given matrix and returns the character.
+    Letters are converted to uppercase, spaces (and digits if the basic ADFGX cipher is used) are converted to their
+    representations, language-specific characters are replaced and all other characters are removed.
+    Raises ValueError if the provided language is not a valid value.
 
-    :param pair: a pair of letters describing a character's position in the matrix
-    :param matrix: the matrix to be searched
-    :return: character at the given position
+    :param lang: language used for adfgx matrix generation
+    :param adfgx: whether the basic version of the cipher is used
+    :return: translation table to be used with str.translate
     """
-    descriptors = (adfgvx_headers if len(matrix) == 6 else adfgx_headers)
-    row, col = descriptors.inverse[pair[0]], descriptors.inverse[pair[1]]
-    char = matrix[row][col]
-    return char
+    table: dict[int, str or None] = dict.fromkeys(range(128))  # get rid of special characters
+    for char in ascii_uppercase + digits:
+        table[ord(char)] = table[ord(char.lower())] = char
+    table[ord(" ")] = space_representation
+    if adfgx is True:
+        for digit in digits:
+            table[ord(digit)] = digit_representations[digit]
+        if lang is not None:
+            if lang not in lang_replacements:
+                raise ValueError("Invalid language specified.")
+            replaced_char, replacement = lang_replacements[lang]
+            table[ord(replaced_char)] = table[ord(replaced_char.lower())] = replacement
+    return table
 
 
 def filterPlainText(plaintext: str, lang: str = None, adfgx: bool = False) -> str:
@@ -190,12 +218,8 @@ def filterPlainText(plaintext: str, lang: str = None, adfgx: bool = False) -> st
     :param adfgx: whether the basic version of the cipher is used
     :return: filtered plaintext prepared for encryption
     """
-    plaintext = unidecode(plaintext).upper().strip()
-    plaintext = convertCharacterRepresentations(plaintext, adfgx)
-    plaintext = "".join(char for char in plaintext if char.isalnum())  # get rid of special characters
-    if adfgx is True:
-        plaintext = replaceLanguageSpecificCharacters(plaintext, lang)
-    return plaintext
+    plaintext = toAscii(plaintext).strip()
+    return plaintext.translate(plainTextTranslationTable(lang, adfgx))
 
 
 def filterCipherText(ciphertext: str, adfgx: bool = False):
@@ -205,14 +229,14 @@ def filterCipherText(ciphertext: str, adfgx: bool = False):
     :param adfgx: whether the basic version of the cipher is used
     :return: filtered ciphertext prepared for decryption
     """
-    ciphertext = unidecode(ciphertext).upper().strip()
+    ciphertext = toAscii(ciphertext).upper().strip()
     ciphertext = "".join(char for char in ciphertext if char.isalpha() or char == " ")
     if len(ciphertext.replace(" ", "")) % 2 > 0:
         raise ValueError("The provided ciphertext is invalid! The number of characters is incorrect!")
     headers = (adfgx_headers if adfgx is True else adfgvx_headers)
-    for char in ciphertext:
-        if char not in headers.inverse and char != " ":
-            raise ValueError("The provided ciphertext is invalid!")
+    allowed: bytes = "".join(headers.values()).encode() + b" "
+    if ciphertext.encode("ascii").translate(None, allowed):  # anything left after deleting allowed characters
+        raise ValueError("The provided ciphertext is invalid!")
     return ciphertext
 
 
@@ -231,31 +255,31 @@ def encrypt(plaintext: str,
     :return: ciphertext
     """
     plaintext = filterPlainText(plaintext, lang, adfgx)
-    if matrix is str:
-        generateMatrix(adfgx, matrix, lang)
-    encoded_text: str = "".join(encodeCharacter(char, matrix) for char in plaintext)  # encode characters in plaintext
+    if isinstance(matrix, str):  # create the matrix from the given data
+        matrix = generateMatrix(adfgx, matrix, lang)
+
+    # Map every character in the matrix to the pair of headers describing its position
+    size: int = len(matrix)
+    descriptors = (adfgvx_headers if size == 6 else adfgx_headers)
+    encoding_table: dict[int, str] = str.maketrans({
+        matrix[row][col]: f"{descriptors[row]}{descriptors[col]}"
+        for row in range(size) for col in range(size)
+    })
+    encoded_text: str = plaintext.translate(encoding_table)  # encode characters in plaintext
+    if len(encoded_text) != 2 * len(plaintext):  # characters missing from the matrix are left untranslated
+        raise Exception("The character couldn't be found in the matrix during encoding.")
     keyword = filterKeyword(keyword, len(encoded_text))
 
     # Create keyword grid (columnar transppsition)
-    keyword_len, encoded_len = len(keyword), len(encoded_text)
-    rows: int = int(encoded_len / keyword_len)
-    keyword_grid = [
-        [encoded_text[i + keyword_len * j] for i in range(keyword_len)]
-        for j in range(rows)
-    ]
-    remainder: int = encoded_len % keyword_len
-    if remainder > 0:  # append the remaining characters that don't take up the entire row
-        keyword_grid.append([encoded_text[i] for i in range(rows * keyword_len, encoded_len)])
-        # fill in empty strings to make it easier to work with
-        [keyword_grid[-1].append("") for _ in range(keyword_len - remainder)]
+    # every column of the grid is a strided slice of the encoded text, the last row may be incomplete
+    keyword_len: int = len(keyword)
+    columns: list[str] = [encoded_text[i::keyword_len] for i in range(keyword_len)]
 
     # Sort the keyword and columns in the keyword grid
-    ciphertext = ""
-    for i in sorted(keyword):
-        ciphertext += "".join([keyword_grid[j][keyword.index(i)] for j in range(len(keyword_grid))])
-        ciphertext += " "
+    order: list[int] = sorted(range(keyword_len), key=lambda i: keyword[i])  # column indices in keyword order
+    ciphertext: str = " ".join(columns[i] for i in order)
 
-    return ciphertext.strip()
+    return ciphertext
 
 
 def decrypt(ciphertext: str,
@@ -265,8 +289,8 @@ def decrypt(ciphertext: str,
             adfgx: bool = False) -> str:
     """Decrypts a ciphertext which was encrypted using the ADFGVX cipher or its simpler ADFGX version.
 
-    Expects ciphertext to have individual columns divided by spaces and the columns to not have any extra characters
-    to fill the empty positions.
+    Expects the columns in the ciphertext to not have any extra characters to fill the empty positions. Spaces dividing
+    individual columns are optional since the length of each column is given by the keyword.
 
     :param ciphertext: ciphertext to be decrypted
     :param keyword: keyword which was used for encryption
@@ -275,27 +299,30 @@ def decrypt(ciphertext: str,
     :param adfgx: whether the basic version of the cipher is used
     :return: original message
     """
-    ciphertext: str = filterCipherText(ciphertext, adfgx)
-    if matrix is str:
-        generateMatrix(adfgx, matrix, lang)
-    keyword = filterKeyword(keyword, len(ciphertext.replace(" ", "")))
+    ciphertext: str = filterCipherText(ciphertext, adfgx).replace(" ", "")
+    if isinstance(matrix, str):  # create the matrix from the given data
+        matrix = generateMatrix(adfgx, matrix, lang)
+    keyword = filterKeyword(keyword, len(ciphertext))
 
     # Get encoded text
-    ciphertext: list[str] = ciphertext.split()
-    ciphertext: list[list[str]] = [[char for char in ciphertext[ciphertext.index(row)]] for row in ciphertext]
-    keyword_sorted: list[str] = [i for i in sorted(keyword)]
-    column_dict: dict[str, list[str]] = dict(zip(keyword_sorted, ciphertext))
-    column_grid = [column_dict[char] for char in keyword]
-    original_grid = list(map(list, itertools.zip_longest(*column_grid, fillvalue="")))  # encoded text in a 2D list
-    encoded_text: str = "".join(char for row in original_grid for char in row).strip()
+    # columns are written in keyword order, the first `remainder` columns of the grid are one character longer
+    keyword_len, encoded_len = len(keyword), len(ciphertext)
+    rows, remainder = divmod(encoded_len, keyword_len)
+    order: list[int] = sorted(range(keyword_len), key=lambda i: keyword[i])  # column indices in keyword order
+    encoded_text: bytearray = bytearray(encoded_len)
+    start: int = 0
+    for i in order:  # write every column straight to its positions in the encoded text
+        end: int = start + rows + (1 if i < remainder else 0)
+        encoded_text[i::keyword_len] = ciphertext[start:end].encode("ascii")
+        start = end
 
     # Convert encoded text to original plaintext
-    plaintext: str = ""
-    tmp: int = 0
-    for i in range(2, len(encoded_text) + 1, 2):
-        plaintext += decodeCharacter(encoded_text[tmp:i], matrix)
-        tmp = i
-    plaintext = convertCharacterRepresentations(plaintext, adfgx, True)  # convert character representations back
+    size: int = len(matrix)
+    header_indices: bytes = (adfgvx_header_indices if size == 6 else adfgx_header_indices)
+    indices: bytes = encoded_text.translate(header_indices)  # row and column index of each character
+    flat_matrix: str = "".join(map("".join, matrix))
+    plaintext: str = "".join(flat_matrix[row * size + col] for row, col in zip(indices[0::2], indices[1::2]))
+    plaintext = convertCharacterRepresentations(plaintext, adfgx)  # convert character representations back
 
     return plaintext
 
@@ -312,6 +339,11 @@ class ADFGVXCipher(QMainWindow, Ui_MainWindow):
         self.matrix_55: list[list[str]] or None = None  # adfgx version
         self.matrix_66: list[list[str]] or None = None  # adfgvx version
         self.output: str or None = None  # default value
+        # labels representing the cells of both matrices in GUI
+        self.labels_55: list[list[QLabel]] = [
+            [self.findChild(QLabel, f"table_item_{row+1}{col+1}_adfgx") for col in range(5)] for row in range(5)]
+        self.labels_66: list[list[QLabel]] = [
+            [self.findChild(QLabel, f"table_item_{row+1}{col+1}_adfgvx") for col in range(6)] for row in range(6)]
 
         self.button_execute.clicked.connect(self.execute)
         # ADFGX buttons
@@ -361,9 +393,9 @@ class ADFGVXCipher(QMainWindow, Ui_MainWindow):
         try:
             # Generate the matrix
             lang: str or None = None
-            version: str = "adfgvx"
+            labels: list[list[QLabel]] = self.labels_66
             if adfgx is True:
-                version = "adfgx"
+                labels = self.labels_55
                 lang = ("en" if self.english_radio.isChecked() else "cs")
             matrix: list[list[str]] = generateMatrix(adfgx, data, lang)
             # Save the current matrix to be used during encryption or decryption
@@ -374,8 +406,7 @@ class ADFGVXCipher(QMainWindow, Ui_MainWindow):
             # Update matrix values in GUI
             for row in range(len(matrix)):
                 for col in range(len(matrix[row])):
-                    self.findChild(QLabel, f"table_item_{row+1}{col+1}_{version}")\
-                        .setText(matrix[row][col])
+                    labels[row][col].setText(matrix[row][col])
         except Exception as e:
             self.showErrorMessage(e)
 